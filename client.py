@@ -12,7 +12,10 @@ import asyncio
 import argparse
 import json
 import os
+import threading
+import time
 import httpx
+import orjson
 from typing import List, Optional
 
 from acp_sdk.client import Client as ACPClient
@@ -47,22 +50,73 @@ def _normalize_output(seq):
 # e.g. http://localhost:8002/acp
 ACP_SERVER_URL = os.getenv("ACP_URL", "http://127.0.0.1:8002")
 
+# One pooled HTTP client per ACP base URL, shared by discovery, the ACP SDK and the raw-POST
+# fallback, so repeated prompts reuse keep-alive connections instead of re-handshaking.
+_HTTP: dict[str, httpx.AsyncClient] = {}
+
+
+def _http(base_url: str) -> httpx.AsyncClient:
+    """Return the shared HTTP client for base_url, creating it on first use."""
+    client = _HTTP.get(base_url)
+    if client is None:
+        client = _HTTP[base_url] = httpx.AsyncClient(
+            base_url=base_url,
+            # No read timeout: agent runs (LLM + tool calls) can outlast 10s, as the SDK default allowed.
+            timeout=httpx.Timeout(10.0, read=None),
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100, keepalive_expiry=60.0),
+        )
+    return client
+
+
+async def _close_http() -> None:
+    while _HTTP:
+        _, client = _HTTP.popitem()
+        await client.aclose()
+
+
+# Last successful /agents listing per base URL as (monotonic timestamp, names); the
+# roster rarely changes within a CLI session. Tune with ACP_DISCOVER_TTL (seconds).
+_disc_cache: dict[str, tuple[float, List[str]]] = {}
+ACP_DISCOVER_TTL = float(os.getenv("ACP_DISCOVER_TTL", "60"))
+
+
+def _cached_agents(base_url: str) -> Optional[List[str]]:
+    """Return the cached agent names for base_url if still fresh, else None."""
+    hit = _disc_cache.get(base_url)
+    if hit is not None and time.monotonic() - hit[0] < ACP_DISCOVER_TTL:
+        return hit[1]
+    return None
+
+
+def _invalidate_agents(base_url: str, exc: BaseException, *, discovery: bool = False) -> None:
+    """
+    Drop the cached roster on connection errors (or a 404 from /agents itself) so a
+    restarted server is re-read. A 404 from /runs only means that agent is unknown.
+    """
+    is_404 = isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code == 404
+    if isinstance(exc, httpx.TransportError) or (discovery and is_404):
+        _disc_cache.pop(base_url, None)
+
 
 async def discover_agents(base_url: str) -> List[str]:
+    cached = _cached_agents(base_url)
+    if cached is not None:
+        return cached
     try:
-        async with httpx.AsyncClient(base_url=base_url, timeout=5.0) as http:
-            r = await http.get("/agents")
-            r.raise_for_status()
-            data = r.json()
-            names: List[str] = []
-            # Support {"agents":[{"name":"..."}]} or {"agents":["...", "..."]}
-            for item in data.get("agents", []):
-                if isinstance(item, dict) and isinstance(item.get("name"), str):
-                    names.append(item["name"])
-                elif isinstance(item, str):
-                    names.append(item)
-            return names
-    except Exception:
+        r = await _http(base_url).get("/agents", timeout=5.0)
+        r.raise_for_status()
+        data = orjson.loads(r.content)
+        names: List[str] = []
+        # Support {"agents":[{"name":"..."}]} or {"agents":["...", "..."]}
+        for item in data.get("agents", []):
+            if isinstance(item, dict) and isinstance(item.get("name"), str):
+                names.append(item["name"])
+            elif isinstance(item, str):
+                names.append(item)
+        _disc_cache[base_url] = (time.monotonic(), names)
+        return names
+    except Exception as e:
+        _invalidate_agents(base_url, e, discovery=True)
         return []
 
 
@@ -77,27 +131,32 @@ async def choose_default_agent(base_url: str) -> Optional[str]:
 async def run_with_fallback(base_url: str, agent_name: str, text: Optional[str]):
     """Try SDK run (agent=...), fall back to raw POST with agent_name if needed."""
     parts = [] if text is None else [MessagePart(content=text)]
-    async with ACPClient(base_url=base_url) as client:
-        try:
-            run = await client.run_sync(agent=agent_name, input=[Message(parts=parts)])
-            return list(run.output)
-        except ACPError:
-            # Fallback: server expects {"agent_name": ...}
-            async with httpx.AsyncClient(base_url=base_url, timeout=10.0) as http:
+    http = _http(base_url)
+    try:
+        # The SDK client borrows the shared pool; manage_client=False keeps it open on exit.
+        async with ACPClient(client=http, manage_client=False) as client:
+            try:
+                run = await client.run_sync(agent=agent_name, input=[Message(parts=parts)])
+                return list(run.output)
+            except ACPError:
+                # Fallback: server expects {"agent_name": ...}
                 r = await http.post(
                     "/runs",
                     headers={"Content-Type": "application/json"},
-                    json={
+                    content=orjson.dumps({
                         "agent_name": agent_name,
                         "input": [] if text is None else [{"parts": [{"content": text}]}],
-                    },
+                    }),
                 )
                 r.raise_for_status()
-                data = r.json()
+                data = orjson.loads(r.content)
                 out = data.get("output") or data.get("data") or []
                 if isinstance(out, str):
                     out = [out]
                 return out
+    except Exception as e:
+        _invalidate_agents(base_url, e)
+        raise
 
 
 async def ask_anything(base_url: str, text: str) -> None:
@@ -112,16 +171,60 @@ async def ask_anything(base_url: str, text: str) -> None:
 
 
 async def call_named(base_url: str, agent_name: str, text: Optional[str]) -> None:
-    names = await discover_agents(base_url)
+    names = _cached_agents(base_url)
+    if names is None:
+        # Cold cache: discover and run speculatively in parallel; the run is discarded
+        # (including any error it raised) if the name turns out to be unknown.
+        names, out = await asyncio.gather(
+            discover_agents(base_url),
+            run_with_fallback(base_url, agent_name, text),
+            return_exceptions=True,
+        )
+        if isinstance(names, BaseException):
+            raise names
+    elif agent_name in names:
+        # Warm cache: the name is validated locally, so go straight to the run.
+        out = await run_with_fallback(base_url, agent_name, text)
     if agent_name not in names:
         print(f"Agent '{agent_name}' not found at {base_url}. Available: {', '.join(names) or '<none>'}")
         return
-    out = await run_with_fallback(base_url, agent_name, text)
+    if isinstance(out, BaseException):
+        raise out
     out = _normalize_output(out)
     label = text if text is not None else "(no input)"
     print(f"{agent_name}({label}) →", "".join(out))
 
 
+async def _ainput(prompt: str) -> str:
+    """
+    input() on a daemon thread. Unlike asyncio.to_thread, shutdown never waits for it, so
+    Ctrl-C at a prompt exits immediately while the loop stays free between prompts.
+    """
+    loop = asyncio.get_running_loop()
+    fut: asyncio.Future[str] = loop.create_future()
+
+    def _settle(result: Optional[str], exc: Optional[BaseException]) -> None:
+        if fut.done():
+            return
+        if exc is not None:
+            fut.set_exception(exc)
+        else:
+            fut.set_result(result)
+
+    def _read() -> None:
+        try:
+            line, err = input(prompt), None
+        except BaseException as e:  # EOFError etc. surface in the awaiting task
+            line, err = None, e
+        try:
+            loop.call_soon_threadsafe(_settle, line, err)
+        except RuntimeError:
+            pass  # loop already closed
+
+    threading.Thread(target=_read, name="acp-input", daemon=True).start()
+    return await fut
+
+
 async def main() -> None:
     parser = argparse.ArgumentParser(description="ACP-only client")
     parser.add_argument("--acp-url", default=None, help="ACP base URL (e.g., http://127.0.0.1:8002 or .../acp)")
@@ -133,36 +236,39 @@ async def main() -> None:
 
     base = args.acp_url or ACP_SERVER_URL
 
-    if args.date:
-        await call_named(base, "dateAgent", None)
-    elif args.agent is not None and args.agent_name is None:
-        await call_named(base, "agent", args.agent)
-    elif args.agent_name:
-        # If positional message is given, use it as input; else None
-        text = args.message if args.message is not None else args.agent
-        await call_named(base, args.agent_name, text)
-    elif args.message:
-        await ask_anything(base, args.message)
-    else:
-        # simple interactive mode
-        print("ACP interactive mode (q to quit).")
-        while True:
-            choice = input("1) ask-anything  2) dateAgent  3) named agent  q) quit: ").strip().lower()
-            if choice == "1":
-                msg = input("message: ")
-                await ask_anything(base, msg)
-            elif choice == "2":
-                await call_named(base, "dateAgent", None)
-            elif choice == "3":
-                name = input("agent name: ").strip()
-                msg = input("message (empty for none): ").strip()
-                await call_named(base, name, msg if msg else None)
-            elif choice.startswith("q"):
-                print("bye")
-                break
-            else:
-                print("invalid; try again")
-
+    try:
+        if args.date:
+            await call_named(base, "dateAgent", None)
+        elif args.agent is not None and args.agent_name is None:
+            await call_named(base, "agent", args.agent)
+        elif args.agent_name:
+            # If positional message is given, use it as input; else None
+            text = args.message if args.message is not None else args.agent
+            await call_named(base, args.agent_name, text)
+        elif args.message:
+            await ask_anything(base, args.message)
+        else:
+            # simple interactive mode; prompts are read on a daemon thread so the loop
+            # (and the pooled HTTP client) keeps running while we wait for the user
+            print("ACP interactive mode (q to quit).")
+            while True:
+                choice = (await _ainput("1) ask-anything  2) dateAgent  3) named agent  q) quit: ")).strip().lower()
+                if choice == "1":
+                    msg = await _ainput("message: ")
+                    await ask_anything(base, msg)
+                elif choice == "2":
+                    await call_named(base, "dateAgent", None)
+                elif choice == "3":
+                    name = (await _ainput("agent name: ")).strip()
+                    msg = (await _ainput("message (empty for none): ")).strip()
+                    await call_named(base, name, msg if msg else None)
+                elif choice.startswith("q"):
+                    print("bye")
+                    break
+                else:
+                    print("invalid; try again")
+    finally:
+        await _close_http()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -1,14 +1,24 @@
+import asyncio
+import functools
+import inspect
+import logging
 import os
 import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
 
 from dotenv import load_dotenv
+import httpx
 from fastmcp import FastMCP, mcp_config
-from langchain_community.document_loaders.firecrawl import FireCrawlLoader
+from firecrawl import AsyncFirecrawlApp
 from langchain_community.retrievers import PineconeHybridSearchRetriever
 from langchain_community.tools import DuckDuckGoSearchResults
 from langchain_openai import OpenAIEmbeddings
 from langchain_pinecone import PineconeVectorStore
 import openai
+import orjson
 from pinecone_text.sparse import BM25Encoder
 from supabase import Client, create_client
 import yfinance as yf
@@ -18,47 +28,185 @@ import datetime
 
 load_dotenv()
 
+# Libraries stay at WARNING (mcp and httpx log every request at INFO); LOG_LEVEL only tunes our own logger
+logging.basicConfig(level=logging.WARNING)
+log = logging.getLogger("searchai.server")
+log.setLevel((os.getenv("LOG_LEVEL") or "INFO").upper())
+
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 PINECONE_API_KEY = os.getenv("PINECONE_API_KEY")
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 FIRECRAWL_API_KEY = os.getenv("FIRECRAWL_API_KEY")
+YF_TTL = float(os.getenv("YF_TTL", "30"))  # seconds a fetched price is reused
+CRAWL_TTL = float(os.getenv("CRAWL_TTL", "300"))  # seconds crawled content for a query is reused
+BM25_CACHE_PATH = os.getenv("BM25_CACHE_PATH", os.path.join(os.path.dirname(__file__), "bm25.json"))
+
+# orjson for non-string tool results (e.g. batch_tool's list)
+mcp = FastMCP("SearchAI", tool_serializer=lambda data: orjson.dumps(data, default=str).decode())
+
+def _bm25_encoder() -> BM25Encoder:
+    """
+    Load the BM25 params from BM25_CACHE_PATH; on first boot fit the default corpus (a download) and save it there.
+    """
+    if os.path.exists(BM25_CACHE_PATH):
+        try:
+            return BM25Encoder().load(BM25_CACHE_PATH)
+        except Exception as e:
+            log.warning("ignoring unreadable BM25 cache %s: %s", BM25_CACHE_PATH, e)
+    encoder = BM25Encoder.default()
+    tmp_path = None
+    try:
+        # Write a uniquely named sibling then rename, so a crash mid-dump never leaves a truncated
+        # cache behind and concurrent first boots never write the same temp file
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(BM25_CACHE_PATH) or ".", prefix=f"{os.path.basename(BM25_CACHE_PATH)}.", suffix=".tmp"
+        )
+        os.close(fd)
+        encoder.dump(tmp_path)
+        os.replace(tmp_path, BM25_CACHE_PATH)
+    except OSError as e:
+        log.warning("could not save BM25 cache to %s: %s", BM25_CACHE_PATH, e)
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return encoder
+
+_retriever_lock = threading.Lock()
+
+def _retriever() -> PineconeHybridSearchRetriever:
+    """
+    Build the hybrid retriever once per process; the embedder, BM25 corpus load and Pinecone client are reused across calls.
+    """
+    # Tools call this from worker threads; the lock keeps concurrent first calls from each building one
+    with _retriever_lock:
+        return _build_retriever()
+
+@functools.lru_cache(maxsize=1)
+def _build_retriever() -> PineconeHybridSearchRetriever:
+    from pinecone import Pinecone
+    # Pooled keep-alive client so consecutive embeddings reuse the OpenAI connection
+    http_client = httpx.Client(
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100, keepalive_expiry=60.0)
+    )
+    embedder = OpenAIEmbeddings(model="text-embedding-3-small", http_client=http_client)
+    bm25_encoder = _bm25_encoder()
+    pc = Pinecone(api_key=PINECONE_API_KEY)
+    index = pc.Index("searchai2")
+    return PineconeHybridSearchRetriever(
+        embeddings=embedder,
+        sparse_encoder=bm25_encoder,
+        index=index
+    )
+
+def _warmup() -> None:
+    """
+    Build the retriever and open the OpenAI and Pinecone connections before serving, so the first request skips DNS/TLS/auth. Failures are non-fatal.
+    """
+    try:
+        retriever = _retriever()
+    except Exception as e:
+        log.warning("retriever warmup skipped: %s", e)
+        return
+    for name, warm in (("OpenAI", lambda: retriever.embeddings.embed_query("warmup")),
+                       ("Pinecone", retriever.index.describe_index_stats)):
+        try:
+            warm()
+        except Exception as e:
+            log.warning("%s warmup failed: %s", name, e)
+
+CRAWL_TOP_K = 3  # search results crawled concurrently per query
+CRAWL_MAX_CHARS = 4000  # Truncate to avoid overlong responses
+
+@functools.lru_cache(maxsize=1)
+def _firecrawl() -> AsyncFirecrawlApp:
+    return AsyncFirecrawlApp(api_key=FIRECRAWL_API_KEY)
 
-mcp = FastMCP("SearchAI")
+async def _crawl(url: str) -> str:
+    # Scrape just this page's main content as markdown. FireCrawlLoader is not usable with the locked
+    # firecrawl SDK (it passes a params= kwarg the SDK forwards verbatim, then treats the pydantic response as a dict).
+    doc = await _firecrawl().scrape_url(url, formats=["markdown"], only_main_content=True)
+    return (doc.markdown or "")[:CRAWL_MAX_CHARS]
+
+def _format_results(search_tool: DuckDuckGoSearchResults, results: list) -> str:
+    # Same layout as DuckDuckGoSearchResults' default "string" output
+    return search_tool.results_separator.join(
+        ", ".join(f"{k}: {v}" for k, v in r.items()) for r in results if isinstance(r, dict)
+    )
+
+CRAWL_CACHE_MAX = 256  # distinct queries kept at most
+
+# query -> (monotonic timestamp, crawled content), oldest first: entries are only ever (re)inserted at the end
+_crawl_cache: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+def _cache_crawl(query: str, content: str) -> None:
+    now = time.monotonic()
+    _crawl_cache.pop(query, None)
+    # Evict from the old end while entries are expired or the cache is full
+    while _crawl_cache:
+        ts, _ = next(iter(_crawl_cache.values()))
+        if now - ts < CRAWL_TTL and len(_crawl_cache) < CRAWL_CACHE_MAX:
+            break
+        _crawl_cache.popitem(last=False)
+    _crawl_cache[query] = (now, content)
 
 @mcp.tool
-def web_crawl_tool(query: str) -> str:
+async def web_crawl_tool(query: str) -> str:
     """
-    Search the web for the query using DuckDuckGo, crawl the top result with FireCrawl, and return the crawled content as text.
+    Search the web for the query using DuckDuckGo, crawl the top results concurrently with FireCrawl, and return the best-ranked crawled content as text.
     """
-    print(f"[SERVER] web_crawl_tool called with query: {query}")
+    log.debug("web_crawl_tool called with query: %s", query)
+    hit = _crawl_cache.get(query)
+    if hit is not None and time.monotonic() - hit[0] < CRAWL_TTL:
+        return hit[1]
     try:
-        search_tool = DuckDuckGoSearchResults()
-        search_results = search_tool.run(query)
-        if not search_results or not isinstance(search_results, list) or not search_results[0].get('link'):
+        search_tool = DuckDuckGoSearchResults(output_format="list")
+        search_results = await asyncio.to_thread(search_tool.run, query)
+        if not isinstance(search_results, list):
             return str(search_results)
-        top_url = search_results[0]['link']
-        print(f"[SERVER] Crawling top URL: {top_url}")
-        loader = FireCrawlLoader(url=top_url, api_key=FIRECRAWL_API_KEY)
-        docs = loader.load()
-        if not docs:
-            return f"No content found for {top_url}"
-        return docs[0].page_content[:4000]  # Truncate to avoid overlong responses
+        urls = [r['link'] for r in search_results[:CRAWL_TOP_K] if isinstance(r, dict) and r.get('link')]
+        if not urls:
+            return _format_results(search_tool, search_results)
+        log.debug("Crawling top URLs: %s", urls)
+        # Crawls run concurrently on the event loop; total wait is the slowest crawl, not the sum.
+        results = await asyncio.gather(*(_crawl(u) for u in urls), return_exceptions=True)
+        content = next((r for r in results if isinstance(r, str) and r), None)
+        if content is not None:
+            _cache_crawl(query, content)
+            return content
+        for url, r in zip(urls, results):
+            if isinstance(r, BaseException):
+                log.warning("crawl of %s failed: %s", url, r)
+        # Nothing crawled: fall back to the search snippets, as before crawling was wired up
+        return _format_results(search_tool, search_results)
     except Exception as e:
+        _crawl_cache.pop(query, None)
         return str(f"Error in web_crawl_tool: {e}")
 
+_price_cache: dict[str, tuple[float, float]] = {}  # symbol -> (monotonic timestamp, price)
+
+def _latest_price(symbol: str) -> float | None:
+    hit = _price_cache.get(symbol)
+    if hit is not None and time.monotonic() - hit[0] < YF_TTL:
+        return hit[1]
+    # A fresh Ticker each miss: yf.Ticker memoizes fast_info, so a reused one would never refresh.
+    ticker_obj = yf.Ticker(symbol)
+    price = ticker_obj.fast_info['last_price'] if hasattr(ticker_obj, 'fast_info') and 'last_price' in ticker_obj.fast_info else None
+    if price is None:
+        # fallback to regular info
+        price = ticker_obj.info.get('regularMarketPrice')
+    if price is not None:
+        _price_cache[symbol] = (time.monotonic(), price)
+    return price
+
 @mcp.tool
-def yahoo_finance_tool(ticker: str) -> str:
+async def yahoo_finance_tool(ticker: str) -> str:
     """
     Fetch the latest price for a given ticker using yfinance.
     """
-    print(f"[SERVER] yahoo_finance_tool called with ticker: {ticker}")
+    log.debug("yahoo_finance_tool called with ticker: %s", ticker)
     try:
-        ticker_obj = yf.Ticker(ticker)
-        price = ticker_obj.fast_info['last_price'] if hasattr(ticker_obj, 'fast_info') and 'last_price' in ticker_obj.fast_info else None
-        if price is None:
-            # fallback to regular info
-            price = ticker_obj.info.get('regularMarketPrice')
+        # yfinance fetches over blocking urllib; keep it off the server's event loop
+        price = await asyncio.to_thread(_latest_price, ticker.upper())
         if price is None:
             return f"Could not fetch price for {ticker}"
         return f"Latest price for {ticker}: {price}"
@@ -66,44 +214,24 @@ def yahoo_finance_tool(ticker: str) -> str:
         return str(f"Error in yahoo_finance_tool: {e}")
     
 @mcp.tool
-def embedder_tool(text: str) -> str:
+async def embedder_tool(text: str) -> str:
     """
     Embed the text for hybrid search (semantic + keyword) using PineconeHybridSearchRetriever.
     """
     try:
-        embedder = OpenAIEmbeddings(model="text-embedding-3-small")
-        bm25_encoder = BM25Encoder().default()
-        from pinecone import Pinecone
-        pc = Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
-        index = pc.Index("searchai2")
-        retriever = PineconeHybridSearchRetriever(
-            embeddings=embedder,
-            sparse_encoder=bm25_encoder,
-            index=index
-        )
-        retriever.add_texts([text])
+        await asyncio.to_thread(lambda: _retriever().add_texts([text]))
         return str("Embedded text into Pinecone for hybrid search.")
     except Exception as e:
         return str(f"Error in embedder_tool: {e}")
 
 @mcp.tool
-def similarity_search_tool(query: str) -> str:
+async def similarity_search_tool(query: str) -> str:
     """
     Perform a hybrid search (semantic + keyword) for the query using PineconeHybridSearchRetriever.
     Returns the most similar documents as a string.
     """
     try:
-        embedder = OpenAIEmbeddings(model="text-embedding-3-small")
-        bm25_encoder = BM25Encoder().default()
-        from pinecone import Pinecone
-        pc = Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
-        index = pc.Index("searchai2")
-        retriever = PineconeHybridSearchRetriever(
-            embeddings=embedder,
-            sparse_encoder=bm25_encoder,
-            index=index
-        )
-        docs = retriever.invoke(query)
+        docs = await asyncio.to_thread(lambda: _retriever().invoke(query))
         if not docs:
             return str("No similar documents found.")
         return str("\n\n".join(doc.page_content for doc in docs))
@@ -113,8 +241,38 @@ def similarity_search_tool(query: str) -> str:
     
 @mcp.tool
 def hello_tool(query: str) -> str:
-    print(f"[SERVER] hello_tool called with query: {query}")
+    log.debug("hello_tool called with query: %s", query)
     return "hello from mcp"
 
+
+# Tools reachable through batch_tool; @mcp.tool wraps each function, .fn is the original.
+_BATCHABLE = {t.name: t.fn for t in (web_crawl_tool, yahoo_finance_tool, embedder_tool, similarity_search_tool, hello_tool)}
+
+async def _dispatch(call: dict) -> str:
+    fn = _BATCHABLE.get(call.get("name"))
+    if fn is None:
+        return f"Error in batch_tool: unknown tool {call.get('name')!r}"
+    payload = call.get("payload") or {}
+    if inspect.iscoroutinefunction(fn):
+        return await fn(**payload)
+    # Sync tools do blocking I/O; run them off the loop so the batch overlaps.
+    return await asyncio.to_thread(fn, **payload)
+
+@mcp.tool
+async def batch_tool(calls: list[dict]) -> list[str]:
+    """
+    Run several tool calls in one round-trip. Each call is {"name": <tool name>, "payload": {<tool arguments>}}.
+    Returns one result string per call, in order.
+    """
+    results = await asyncio.gather(*(_dispatch(c) for c in calls), return_exceptions=True)
+    return [f"Error in batch_tool: {r}" if isinstance(r, BaseException) else str(r) for r in results]
+
 if __name__ == "__main__":
-    mcp.run(transport="http")
\ No newline at end of file
+    _warmup()
+    # mcp.run() drives the server with anyio's default asyncio loop; prefer uvloop when installed
+    try:
+        import uvloop
+    except ImportError:
+        mcp.run(transport="http")
+    else:
+        uvloop.run(mcp.run_async(transport="http"))
\ No newline at end of file
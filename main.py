@@ -1,17 +1,17 @@
-import asyncio
 import os
+import re
 from dotenv import load_dotenv
-from fastmcp import Client
+from functools import lru_cache
 from langchain.agents import AgentType, initialize_agent
-from langchain_community.tools import Tool
 from langchain_openai import ChatOpenAI
 from pydantic import SecretStr
-import concurrent.futures
 from collections.abc import AsyncGenerator
 
 from acp_sdk.models import Message, MessagePart
 from acp_sdk.server import Context, Server
 
+from tools import hello_tool_async, tools, web_crawl_tool_async, yahoo_finance_tool_async
+
 # ------------------------ setup ------------------------
 server = Server()
 load_dotenv()
@@ -20,78 +20,46 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 if not OPENAI_API_KEY:
     raise RuntimeError("OPENAI_API_KEY environment variable is not set.")
 
-MCP_SERVER_URL = "http://localhost:8000/mcp/"
-
-# ---- your MCP tool bridges (kept) ----
-def call_mcp_tool(tool_name, payload):
-    async def _call():
-        async with Client(MCP_SERVER_URL) as client:
-            result = await client.call_tool(tool_name, payload)
-            return result.data if hasattr(result, "data") else str(result)
-    with concurrent.futures.ThreadPoolExecutor() as executor:
-        future = executor.submit(lambda: asyncio.run(_call()))
-        return future.result()
-
-def web_crawl_tool_func(query):
-    return call_mcp_tool("web_crawl_tool", {"query": query})
-
-def yahoo_finance_tool_func(ticker):
-    return call_mcp_tool("yahoo_finance_tool", {"ticker": ticker})
-
-def hello_tool_func(name):
-    return call_mcp_tool("hello_tool", {"name": name})
-
-# You had these defined; we keep them for LangChain agent use:
-tools = [
-    Tool(
-        name="web_crawl_tool",
-        func=web_crawl_tool_func,
-        description="Searches the web and crawls the top result using FireCrawl."
-    ),
-    Tool(
-        name="hello_tool",
-        func=hello_tool_func,
-        description="Returns a hello message from the MCP server"
-    ),
-    Tool(
-        name="yahoo_finance_tool",
-        func=yahoo_finance_tool_func,
-        description="Fetches the latest price for a given ticker using Yahoo Finance."
-    ),
-]
-
-llm = ChatOpenAI(
-    temperature=0,
-    model="gpt-4o-mini",
-    api_key=SecretStr(OPENAI_API_KEY)
-)
+# ---- LLM + LangChain agent, built on first use and shared ----
+@lru_cache(maxsize=1)
+def get_llm() -> ChatOpenAI:
+    return ChatOpenAI(
+        temperature=0,
+        model="gpt-4o-mini",
+        api_key=SecretStr(OPENAI_API_KEY)
+    )
 
 # Optional: a LangChain agent that can use your MCP tools
-lc_agent = initialize_agent(
-    tools,
-    llm,
-    agent=AgentType.ZERO_SHOT_REACT_DESCRIPTION,
-    verbose=False,
-)
+@lru_cache(maxsize=1)
+def get_agent():
+    return initialize_agent(
+        tools,
+        get_llm(),
+        agent=AgentType.ZERO_SHOT_REACT_DESCRIPTION,
+        verbose=False,
+    )
 
 # -------------------- helpers --------------------
 def _extract_text(input_msgs: list[Message]) -> str:
     """Concatenate all string contents from Message.parts."""
-    out: list[str] = []
-    for msg in input_msgs or []:
-        for part in (msg.parts or []):
-            if isinstance(part, MessagePart) and isinstance(part.content, str):
-                out.append(part.content)
-    return " ".join(out).strip()
+    return " ".join(
+        part.content
+        for msg in (input_msgs or [])
+        for part in (msg.parts or [])
+        if isinstance(part, MessagePart) and isinstance(part.content, str)
+    ).strip()
+
+# A whole whitespace/comma-delimited token of 1-6 uppercase letters.
+_TICKER_RE = re.compile(r"(?<![^\s,])[A-Z]{1,6}(?![^\s,])")
+_TICKER_STOP = frozenset({"CEO", "CFO", "CTO", "USD", "A", "AN", "THE", "IS", "OF", "FOR"})
 
 def _maybe_upper_ticker(text: str) -> str | None:
     """Heuristic ticker grab: skip common uppercase words; map vendor names."""
-    STOP = {"CEO", "CFO", "CTO", "USD", "A", "AN", "THE", "IS", "OF", "FOR"}
-    lower = text.lower()
-    if "nvidia" in lower:
+    if "nvidia" in text.lower():
         return "NVDA"
-    for tok in text.replace(",", " ").split():
-        if tok.isalpha() and tok.isupper() and 1 <= len(tok) <= 6 and tok not in STOP:
+    for m in _TICKER_RE.finditer(text):
+        tok = m.group(0)
+        if tok not in _TICKER_STOP:
             return tok
     return None
 
@@ -109,33 +77,36 @@ async def agent(input: list[Message], context: Context) -> AsyncGenerator[str, N
     if not text:
         yield "(empty input)"
         return
+    lower = text.lower()
 
     # 1) finance ticker
     maybe = _maybe_upper_ticker(text)
     if maybe:
         try:
-            res = yahoo_finance_tool_func(maybe)
+            res = await yahoo_finance_tool_async(maybe)
             yield str(res)
             return
         except Exception as e:
             yield f"[agent] MCP finance error: {e}"
 
     # 2) hello tool
-    if text.lower().startswith("hello"):
-        name = text.split(maxsplit=1)[1] if len(text.split()) > 1 else "there"
+    if lower.startswith("hello"):
+        words = text.split(maxsplit=1)
+        name = words[1] if len(words) > 1 else "there"
         try:
-            res = hello_tool_func(name)
+            res = await hello_tool_async(name)
             yield str(res)
             return
         except Exception as e:
             yield f"[agent] MCP hello error: {e}"
 
     # 3) web crawl (simple syntax: "crawl: <query>")
-    if "crawl:" in text.lower():
-        query = text.split("crawl:", 1)[1].strip()
+    at = lower.find("crawl:")
+    if at != -1:
+        query = text[at + len("crawl:"):].strip()
         if query:
             try:
-                res = web_crawl_tool_func(query)
+                res = await web_crawl_tool_async(query)
                 yield str(res)
                 return
             except Exception as e:
@@ -143,9 +114,11 @@ async def agent(input: list[Message], context: Context) -> AsyncGenerator[str, N
 
     # 4) try LC agent to reason w/ your tools
     try:
-        # LC wants a string prompt; it can call our Tool funcs above if it decides to
-        lc_resp = lc_agent.run(text)
-        yield str(lc_resp)
+        # Stream the executor so the event loop keeps serving other runs while the LLM works;
+        # tool calls go through the async twins in tools.py
+        async for chunk in get_agent().astream({"input": text}):
+            if "output" in chunk:
+                yield str(chunk["output"])
         return
     except Exception:
         # 5) fallback: echo
@@ -0,0 +1,101 @@
+"""
+Bridge from the LangChain tools to the FastMCP server.
+
+- One background event loop (daemon thread) owns a single long-lived fastmcp.Client.
+- call_mcp_tool() submits coroutines to that loop, so tool calls pay neither loop
+  creation nor a fresh MCP handshake; acall_mcp_tool() awaits the same call from
+  another event loop without blocking it or hopping through a thread pool.
+- A broken session is dropped and re-opened on the next call; a call whose
+  session dies underneath it fails as soon as that is noticed instead of waiting
+  out MCP_CALL_TIMEOUT.
+"""
+
+import asyncio
+import threading
+
+from fastmcp import Client
+from fastmcp.exceptions import ToolError
+
+MCP_SERVER_URL = "http://localhost:8000/mcp/"
+MCP_CALL_TIMEOUT = 120.0  # seconds; crawls can be slow
+MCP_CONNECT_TIMEOUT = 5.0  # seconds for the initial handshake
+MCP_WATCH_INTERVAL = 0.2  # seconds between session liveness checks during a call
+
+_loop = asyncio.new_event_loop()
+threading.Thread(target=_loop.run_forever, name="mcp-bridge", daemon=True).start()
+
+_client: Client | None = None
+_client_lock = asyncio.Lock()
+
+
+async def _get_client() -> Client:
+    global _client
+    async with _client_lock:
+        if _client is not None and not _client.is_connected():
+            stale, _client = _client, None
+            await _close(stale)
+        if _client is None:
+            client = Client(MCP_SERVER_URL, init_timeout=MCP_CONNECT_TIMEOUT)
+            await client.__aenter__()
+            _client = client
+        return _client
+
+
+async def _close(client: Client) -> None:
+    try:
+        await client.__aexit__(None, None, None)
+    except Exception:
+        pass
+
+
+async def _drop_client(client: Client) -> None:
+    global _client
+    async with _client_lock:
+        if _client is not client:
+            return  # already replaced by another call
+        _client = None
+    await _close(client)
+
+
+async def _watch(client: Client) -> None:
+    # A failed POST does not fail the pending request; it only ends the session,
+    # so poll for that and abort the call instead of hanging until the timeout.
+    while client.is_connected():
+        await asyncio.sleep(MCP_WATCH_INTERVAL)
+    raise ConnectionError(f"MCP session to {MCP_SERVER_URL} was lost")
+
+
+async def _call(tool_name, payload):
+    client = await _get_client()
+    call = asyncio.ensure_future(client.call_tool(tool_name, payload))
+    watch = asyncio.ensure_future(_watch(client))
+    try:
+        await asyncio.wait({call, watch}, return_when=asyncio.FIRST_COMPLETED)
+        result = call.result() if call.done() else watch.result()
+    except ToolError:
+        # The tool itself failed; the session is fine.
+        raise
+    except BaseException:
+        # Includes cancellation from a caller's timeout: the session may be wedged.
+        await _drop_client(client)
+        raise
+    finally:
+        call.cancel()
+        watch.cancel()
+    return result.data if hasattr(result, "data") else str(result)
+
+
+def call_mcp_tool(tool_name, payload):
+    fut = asyncio.run_coroutine_threadsafe(_call(tool_name, payload), _loop)
+    try:
+        return fut.result(timeout=MCP_CALL_TIMEOUT)
+    except TimeoutError:
+        fut.cancel()
+        raise
+
+
+async def acall_mcp_tool(tool_name, payload):
+    fut = asyncio.run_coroutine_threadsafe(_call(tool_name, payload), _loop)
+    # Cancelling the wrapper on timeout also cancels the call on the bridge loop.
+    return await asyncio.wait_for(asyncio.wrap_future(fut), MCP_CALL_TIMEOUT)
+
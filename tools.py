@@ -0,0 +1,91 @@
+"""
+LangChain tools backed by the FastMCP server.
+
+Shared by every agent entry point so the tool list (and its schemas) is defined once.
+"""
+
+import json
+
+from langchain_community.tools import Tool
+
+from mcp_bridge import acall_mcp_tool, call_mcp_tool
+
+# ---- your MCP tool bridges (kept; transport lives in mcp_bridge.py) ----
+def web_crawl_tool_func(query):
+    return call_mcp_tool("web_crawl_tool", {"query": query})
+
+def yahoo_finance_tool_func(ticker):
+    return call_mcp_tool("yahoo_finance_tool", {"ticker": ticker})
+
+def hello_tool_func(name):
+    return call_mcp_tool("hello_tool", {"query": name})
+
+# Async twins: LangChain awaits these from agent.astream on the caller's loop, so no
+# executor thread is tied up per tool call.
+async def web_crawl_tool_async(query):
+    return await acall_mcp_tool("web_crawl_tool", {"query": query})
+
+async def yahoo_finance_tool_async(ticker):
+    return await acall_mcp_tool("yahoo_finance_tool", {"ticker": ticker})
+
+async def hello_tool_async(name):
+    return await acall_mcp_tool("hello_tool", {"query": name})
+
+def batched_call(pairs):
+    """Run [{"name": ..., "payload": {...}}, ...] on the MCP server in a single round-trip."""
+    return call_mcp_tool("batch_tool", {"calls": pairs})
+
+async def abatched_call(pairs):
+    return await acall_mcp_tool("batch_tool", {"calls": pairs})
+
+def _parse_calls(calls):
+    # LangChain hands tools a string; accept a JSON list of calls. Bad JSON comes
+    # back as an error observation (like the server's) instead of ending the agent run.
+    try:
+        pairs = json.loads(calls) if isinstance(calls, str) else calls
+    except ValueError as e:
+        return None, f"Error in batch_tool: invalid JSON input: {e}"
+    if not isinstance(pairs, list):
+        return None, "Error in batch_tool: input must be a JSON list of calls"
+    return pairs, None
+
+def batch_tool_func(calls):
+    pairs, error = _parse_calls(calls)
+    return error or batched_call(pairs)
+
+async def batch_tool_async(calls):
+    pairs, error = _parse_calls(calls)
+    return error or await abatched_call(pairs)
+
+# You had these defined; we keep them for LangChain agent use:
+tools = [
+    Tool(
+        name="web_crawl_tool",
+        func=web_crawl_tool_func,
+        coroutine=web_crawl_tool_async,
+        description="Searches the web and crawls the top result using FireCrawl."
+    ),
+    Tool(
+        name="hello_tool",
+        func=hello_tool_func,
+        coroutine=hello_tool_async,
+        description="Returns a hello message from the MCP server"
+    ),
+    Tool(
+        name="yahoo_finance_tool",
+        func=yahoo_finance_tool_func,
+        coroutine=yahoo_finance_tool_async,
+        description="Fetches the latest price for a given ticker using Yahoo Finance."
+    ),
+    Tool(
+        name="batch_tool",
+        func=batch_tool_func,
+        coroutine=batch_tool_async,
+        description=(
+            "Runs several of the other tools in one call. Input is a JSON list such as "
+            '[{"name": "yahoo_finance_tool", "payload": {"ticker": "AAPL"}}, '
+            '{"name": "yahoo_finance_tool", "payload": {"ticker": "MSFT"}}]. '
+            "Use it when you need the same tool for several inputs."
+        ),
+    ),
+]